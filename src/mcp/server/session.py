@@ -37,6 +37,7 @@ be instantiated directly by users of the MCP framework.
 """
 
 from enum import Enum
+from types import TracebackType
 from typing import Any, TypeVar, overload
 
 import anyio
@@ -102,7 +103,15 @@ class ServerSession(
         self._incoming_message_stream_writer, self._incoming_message_stream_reader = anyio.create_memory_object_stream[
             ServerRequestResponder
         ](0)
-        self._exit_stack.push_async_callback(lambda: self._incoming_message_stream_reader.aclose())
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> bool | None:
+        await self._incoming_message_stream_reader.aclose()
+        return await super().__aexit__(exc_type, exc_val, exc_tb)
 
     @property
     def _receive_request_adapter(self) -> TypeAdapter[types.ClientRequest]:
@@ -32,6 +32,15 @@ MODEL_IMMEDIATE_RESPONSE_KEY = "io.modelcontextprotocol/model-immediate-response
 # Metadata key for associating requests with a task (per MCP spec)
 RELATED_TASK_METADATA_KEY = "io.modelcontextprotocol/related-task"
 
+# Poll interval suggested to clients for new tasks, and the polling fallback
+# when a task does not specify one
+DEFAULT_POLL_INTERVAL_MS = 500
+
+# Statuses a task can never leave once entered
+_TERMINAL_STATUSES: frozenset[TaskStatus] = frozenset(
+    {TASK_STATUS_COMPLETED, TASK_STATUS_FAILED, TASK_STATUS_CANCELLED}
+)
+
 
 def is_terminal(status: TaskStatus) -> bool:
     """Check if a task status represents a terminal state.
@@ -44,7 +53,7 @@ def is_terminal(status: TaskStatus) -> bool:
     Returns:
         True if the status is terminal (completed, failed, or cancelled)
     """
-    return status in (TASK_STATUS_COMPLETED, TASK_STATUS_FAILED, TASK_STATUS_CANCELLED)
+    return status in _TERMINAL_STATUSES
 
 
 async def cancel_task(
@@ -85,7 +94,9 @@ async def cancel_task(
 
     # Update task to cancelled status
     cancelled_task = await store.update_task(task_id, status=TASK_STATUS_CANCELLED)
-    return CancelTaskResult(**cancelled_task.model_dump())
+    # The store returns an already-validated Task, so copy its fields across
+    # without a dump-and-revalidate round trip
+    return CancelTaskResult.model_construct(**dict(cancelled_task))
 
 
 def generate_task_id() -> str:
@@ -115,7 +126,7 @@ def create_task_state(
         created_at=now,
         last_updated_at=now,
         ttl=metadata.ttl,
-        poll_interval=500,  # Default 500ms poll interval
+        poll_interval=DEFAULT_POLL_INTERVAL_MS,
     )
 
 
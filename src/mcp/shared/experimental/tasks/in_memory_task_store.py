@@ -7,8 +7,11 @@ Note: This is not suitable for production use as all data is lost on restart.
 For production, consider implementing TaskStore with a database or distributed cache.
 """
 
+import heapq
+import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from itertools import islice
 
 import anyio
 
@@ -16,8 +19,10 @@ from mcp.shared.experimental.tasks.helpers import create_task_state, is_terminal
 from mcp.shared.experimental.tasks.store import TaskStore
 from mcp.types import Result, Task, TaskMetadata, TaskStatus
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class StoredTask:
     """Internal storage representation of a task."""
 
@@ -34,6 +39,8 @@ class InMemoryTaskStore(TaskStore):
     - Automatic TTL-based cleanup (lazy expiration)
     - Thread-safe for single-process async use
     - Pagination support for list_tasks
+    - Optional cap on stored tasks (max_tasks); the oldest finished task is
+      evicted to make room, and creation fails if every task is still active
 
     Limitations:
     - All data lost on restart
@@ -43,28 +50,89 @@ class InMemoryTaskStore(TaskStore):
     For production, implement TaskStore with Redis, PostgreSQL, etc.
     """
 
-    def __init__(self, page_size: int = 10) -> None:
+    def __init__(self, page_size: int = 10, max_tasks: int | None = None) -> None:
         self._tasks: dict[str, StoredTask] = {}
+        # Min-heap of (expires_at, task_id) so cleanup only touches tasks that are due
+        self._expiry_heap: list[tuple[datetime, str]] = []
         self._page_size = page_size
+        self._max_tasks = max_tasks
         self._update_events: dict[str, anyio.Event] = {}
 
-    def _calculate_expiry(self, ttl_ms: int | None) -> datetime | None:
-        """Calculate expiry time from TTL in milliseconds."""
+    def _calculate_expiry(self, ttl_ms: int | None, now: datetime) -> datetime | None:
+        """Calculate expiry time from TTL in milliseconds, relative to `now`."""
         if ttl_ms is None:
             return None
-        return datetime.now(timezone.utc) + timedelta(milliseconds=ttl_ms)
-
-    def _is_expired(self, stored: StoredTask) -> bool:
-        """Check if a task has expired."""
-        if stored.expires_at is None:
+        return now + timedelta(milliseconds=ttl_ms)
+
+    def _schedule_expiry(self, task_id: str, stored: StoredTask) -> None:
+        """Register a task's expiry time with the cleanup heap."""
+        if stored.expires_at is not None:
+            heapq.heappush(self._expiry_heap, (stored.expires_at, task_id))
+            self._compact_expiry_heap()
+
+    def _compact_expiry_heap(self) -> None:
+        """Drop stale heap entries once they can outnumber live tasks two to one.
+
+        Deletes and expiry resets leave their old entries in the heap (lazy
+        deletion) so those paths stay O(1). Compacting in place keeps the heap
+        bounded without invalidating a sweep that is iterating it.
+        """
+        heap = self._expiry_heap
+        tasks = self._tasks
+        if len(heap) <= 2 * len(tasks):
+            return
+        heap[:] = [
+            (deadline, task_id)
+            for deadline, task_id in heap
+            if (stored := tasks.get(task_id)) is not None and stored.expires_at == deadline
+        ]
+        heapq.heapify(heap)
+
+    def _remove_task(self, task_id: str) -> bool:
+        """Remove a task and release anyone waiting on it. Returns False if not found."""
+        if self._tasks.pop(task_id, None) is None:
             return False
-        return datetime.now(timezone.utc) >= stored.expires_at
+        self._compact_expiry_heap()
+        # Wake waiters so they re-check and observe the task is gone
+        event = self._update_events.pop(task_id, None)
+        if event is not None:
+            event.set()
+        return True
+
+    def _evict_for_capacity(self) -> None:
+        """Make room for one more task when the store is at max_tasks."""
+        if self._max_tasks is None or len(self._tasks) < self._max_tasks:
+            return
+        # Insertion order is creation order; active tasks are never dropped
+        for task_id, stored in self._tasks.items():
+            if is_terminal(stored.task.status):
+                self._remove_task(task_id)
+                return
+        raise ValueError(f"Task limit of {self._max_tasks} reached")
 
     def _cleanup_expired(self) -> None:
-        """Remove all expired tasks. Called lazily during access operations."""
-        expired_ids = [task_id for task_id, stored in self._tasks.items() if self._is_expired(stored)]
-        for task_id in expired_ids:
-            del self._tasks[task_id]
+        """Remove all expired tasks. Called lazily at the start of every access.
+
+        With nothing due this is a single peek at the heap, so running it on
+        every call is cheaper than throttling it and serving stale tasks.
+
+        Only heap entries whose deadline has passed are inspected. An entry may be
+        stale (the task was deleted or its expiry was reset), so it is skipped
+        unless it still matches the task's current expiry.
+        """
+        now = datetime.now(timezone.utc)
+        heap = self._expiry_heap
+        # Drain every entry due at `now` in one pass, then report once
+        removed = 0
+        while heap and heap[0][0] <= now:
+            deadline, task_id = heapq.heappop(heap)
+            stored = self._tasks.get(task_id)
+            if stored is None or stored.expires_at != deadline:
+                continue
+            self._remove_task(task_id)
+            removed += 1
+        if removed:
+            logger.debug("Cleaned up %d expired tasks", removed)
 
     async def create_task(
         self,
@@ -80,14 +148,19 @@ class InMemoryTaskStore(TaskStore):
         if task.task_id in self._tasks:
             raise ValueError(f"Task with ID {task.task_id} already exists")
 
+        self._evict_for_capacity()
+
+        # Expiry is fixed at creation, measured from the task's own created_at
         stored = StoredTask(
             task=task,
-            expires_at=self._calculate_expiry(metadata.ttl),
+            expires_at=self._calculate_expiry(metadata.ttl, task.created_at),
         )
         self._tasks[task.task_id] = stored
+        self._schedule_expiry(task.task_id, stored)
 
-        # Return a copy to prevent external modification
-        return Task(**task.model_dump())
+        # Return a copy to prevent external modification. Task fields are all
+        # immutable values, so a shallow copy is enough and skips re-validation.
+        return task.model_copy()
 
     async def get_task(self, task_id: str) -> Task | None:
         """Get a task by ID."""
@@ -99,7 +172,7 @@ class InMemoryTaskStore(TaskStore):
             return None
 
         # Return a copy to prevent external modification
-        return Task(**stored.task.model_dump())
+        return stored.task.model_copy()
 
     async def update_task(
         self,
@@ -108,6 +181,9 @@ class InMemoryTaskStore(TaskStore):
         status_message: str | None = None,
     ) -> Task:
         """Update a task's status and/or message."""
+        # Cleanup expired tasks on access
+        self._cleanup_expired()
+
         stored = self._tasks.get(task_id)
         if stored is None:
             raise ValueError(f"Task with ID {task_id} not found")
@@ -125,20 +201,25 @@ class InMemoryTaskStore(TaskStore):
             stored.task.status_message = status_message
 
         # Update last_updated_at on any change
-        stored.task.last_updated_at = datetime.now(timezone.utc)
+        now = datetime.now(timezone.utc)
+        stored.task.last_updated_at = now
 
         # If task is now terminal and has TTL, reset expiry timer
         if status is not None and is_terminal(status) and stored.task.ttl is not None:
-            stored.expires_at = self._calculate_expiry(stored.task.ttl)
+            stored.expires_at = self._calculate_expiry(stored.task.ttl, now)
+            self._schedule_expiry(task_id, stored)
 
         # Notify waiters if status changed
         if status_changed:
             await self.notify_update(task_id)
 
-        return Task(**stored.task.model_dump())
+        return stored.task.model_copy()
 
     async def store_result(self, task_id: str, result: Result) -> None:
         """Store the result for a task."""
+        # Cleanup expired tasks on access
+        self._cleanup_expired()
+
         stored = self._tasks.get(task_id)
         if stored is None:
             raise ValueError(f"Task with ID {task_id} not found")
@@ -147,6 +228,9 @@ class InMemoryTaskStore(TaskStore):
 
     async def get_result(self, task_id: str) -> Result | None:
         """Get the stored result for a task."""
+        # Cleanup expired tasks on access
+        self._cleanup_expired()
+
         stored = self._tasks.get(task_id)
         if stored is None:
             return None
@@ -161,36 +245,41 @@ class InMemoryTaskStore(TaskStore):
         # Cleanup expired tasks on access
         self._cleanup_expired()
 
-        all_task_ids = list(self._tasks.keys())
+        # The task dict doubles as the cursor index: membership is O(1) and its
+        # insertion order is the listing order, so no key list is materialized
+        if cursor is not None and cursor not in self._tasks:
+            raise ValueError(f"Invalid cursor: {cursor}")
 
-        start_index = 0
+        task_ids = iter(self._tasks)
         if cursor is not None:
-            try:
-                cursor_index = all_task_ids.index(cursor)
-                start_index = cursor_index + 1
-            except ValueError:
-                raise ValueError(f"Invalid cursor: {cursor}")
+            for task_id in task_ids:  # pragma: no branch
+                if task_id == cursor:
+                    break
 
-        page_task_ids = all_task_ids[start_index : start_index + self._page_size]
-        tasks = [Task(**self._tasks[tid].task.model_dump()) for tid in page_task_ids]
+        # Fetch one extra ID to learn whether another page follows
+        window = list(islice(task_ids, self._page_size + 1))
+        page_task_ids = window[: self._page_size]
+        tasks = [self._tasks[tid].task.model_copy() for tid in page_task_ids]
 
         # Determine next cursor
         next_cursor = None
-        if start_index + self._page_size < len(all_task_ids) and page_task_ids:
+        if len(window) > self._page_size and page_task_ids:
             next_cursor = page_task_ids[-1]
 
         return tasks, next_cursor
 
     async def delete_task(self, task_id: str) -> bool:
         """Delete a task."""
-        if task_id not in self._tasks:
-            return False
+        # Cleanup expired tasks on access
+        self._cleanup_expired()
 
-        del self._tasks[task_id]
-        return True
+        return self._remove_task(task_id)
 
     async def wait_for_update(self, task_id: str) -> None:
-        """Wait until the task status changes."""
+        """Wait until the task status changes or the task is removed."""
+        # Cleanup expired tasks on access
+        self._cleanup_expired()
+
         if task_id not in self._tasks:
             raise ValueError(f"Task with ID {task_id} not found")
 
@@ -209,9 +298,10 @@ class InMemoryTaskStore(TaskStore):
     def cleanup(self) -> None:
         """Cleanup all tasks (useful for testing or graceful shutdown)."""
         self._tasks.clear()
+        self._expiry_heap.clear()
         self._update_events.clear()
 
     def get_all_tasks(self) -> list[Task]:
         """Get all tasks (useful for debugging). Returns copies to prevent modification."""
         self._cleanup_expired()
-        return [Task(**stored.task.model_dump()) for stored in self._tasks.values()]
+        return [stored.task.model_copy() for stored in self._tasks.values()]
@@ -22,7 +22,7 @@ from mcp.shared.experimental.tasks.resolver import Resolver
 from mcp.types import JSONRPCNotification, JSONRPCRequest, RequestId
 
 
-@dataclass
+@dataclass(slots=True)
 class QueuedMessage:
     """A message queued for delivery via tasks/result.
 
@@ -156,9 +156,10 @@ class InMemoryTaskMessageQueue(TaskMessageQueue):
 
     def _get_queue(self, task_id: str) -> list[QueuedMessage]:
         """Get or create the queue for a task."""
-        if task_id not in self._queues:
-            self._queues[task_id] = []
-        return self._queues[task_id]
+        queue = self._queues.get(task_id)
+        if queue is None:
+            queue = self._queues[task_id] = []
+        return queue
 
     async def enqueue(self, task_id: str, message: QueuedMessage) -> None:
         """Add a message to the queue."""
@@ -188,10 +189,8 @@ class InMemoryTaskMessageQueue(TaskMessageQueue):
 
     async def clear(self, task_id: str) -> list[QueuedMessage]:
         """Remove and return all messages."""
-        queue = self._get_queue(task_id)
-        messages = list(queue)
-        queue.clear()
-        return messages
+        # Detach the whole list rather than copying and emptying it
+        return self._queues.pop(task_id, [])
 
     async def wait_for_message(self, task_id: str) -> None:
         """Wait until a message is available."""
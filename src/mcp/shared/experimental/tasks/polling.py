@@ -10,14 +10,14 @@ from collections.abc import AsyncIterator, Awaitable, Callable
 
 import anyio
 
-from mcp.shared.experimental.tasks.helpers import is_terminal
+from mcp.shared.experimental.tasks.helpers import DEFAULT_POLL_INTERVAL_MS, is_terminal
 from mcp.types import GetTaskResult
 
 
 async def poll_until_terminal(
     get_task: Callable[[str], Awaitable[GetTaskResult]],
     task_id: str,
-    default_interval_ms: int = 500,
+    default_interval_ms: int = DEFAULT_POLL_INTERVAL_MS,
 ) -> AsyncIterator[GetTaskResult]:
     """Poll a task until it reaches terminal status.
 
@@ -122,7 +122,12 @@ class TaskStore(ABC):
 
         This blocks until either:
         1. The task status changes
-        2. The wait is cancelled
+        2. The task is removed (deleted or expired)
+        3. The wait is cancelled
+
+        A normal return does not mean the task still exists, so callers should
+        re-check with get_task(). Implementations that remove tasks must release
+        waiters rather than leave them blocked forever.
 
         Used by tasks/result to wait for task completion or status changes.
 
@@ -1,9 +1,11 @@
 """Tests for TaskContext and helper functions."""
 
+from uuid import UUID
+
 import pytest
 
 from mcp.shared.experimental.tasks.context import TaskContext
-from mcp.shared.experimental.tasks.helpers import create_task_state, task_execution
+from mcp.shared.experimental.tasks.helpers import create_task_state, generate_task_id, task_execution
 from mcp.shared.experimental.tasks.in_memory_task_store import InMemoryTaskStore
 from mcp.types import CallToolResult, TaskMetadata, TextContent
 
@@ -104,6 +106,14 @@ def test_create_task_state_generates_id() -> None:
     assert task1.task_id != task2.task_id
 
 
+def test_generate_task_id_unique() -> None:
+    """generate_task_id yields distinct UUID4 strings."""
+    task_ids = [generate_task_id() for _ in range(200)]
+
+    assert len(set(task_ids)) == len(task_ids)
+    assert all(UUID(task_id).version == 4 for task_id in task_ids)
+
+
 def test_create_task_state_uses_provided_id() -> None:
     """create_task_state uses the provided task ID."""
     task = create_task_state(TaskMetadata(ttl=60000), task_id="my-task-123")
@@ -1,8 +1,10 @@
 """Tests for InMemoryTaskStore."""
 
+import logging
 from collections.abc import AsyncIterator
 from datetime import datetime, timedelta, timezone
 
+import anyio
 import pytest
 
 from mcp.shared.exceptions import MCPError
@@ -19,6 +21,14 @@ async def store() -> AsyncIterator[InMemoryTaskStore]:
     store.cleanup()
 
 
+def set_expiry(store: InMemoryTaskStore, task_id: str, expires_at: datetime) -> None:
+    """Point a task's expiry at a fixed time and register it with the cleanup heap."""
+    stored = store._tasks.get(task_id)
+    assert stored is not None
+    stored.expires_at = expires_at
+    store._schedule_expiry(task_id, stored)
+
+
 @pytest.mark.anyio
 async def test_create_and_get(store: InMemoryTaskStore) -> None:
     """Test InMemoryTaskStore create and get operations."""
@@ -82,6 +92,22 @@ async def test_update_status(store: InMemoryTaskStore) -> None:
     assert retrieved.status_message == "All done!"
 
 
+@pytest.mark.anyio
+async def test_returned_tasks_are_copies(store: InMemoryTaskStore) -> None:
+    """Test that mutating a returned task does not affect the stored task."""
+    task = await store.create_task(metadata=TaskMetadata(ttl=60000))
+    task.status = "failed"
+
+    retrieved = await store.get_task(task.task_id)
+    assert retrieved is not None
+    assert retrieved.status == "working"
+    retrieved.status_message = "tampered"
+
+    tasks, _ = await store.list_tasks()
+    assert tasks[0].status == "working"
+    assert tasks[0].status_message is None
+
+
 @pytest.mark.anyio
 async def test_update_nonexistent_raises(store: InMemoryTaskStore) -> None:
     """Test that updating a nonexistent task raises."""
@@ -158,6 +184,56 @@ async def test_list_tasks_pagination() -> None:
     store.cleanup()
 
 
+@pytest.mark.anyio
+async def test_list_tasks_pagination_exact_multiple() -> None:
+    """Test that the last full page has no next cursor."""
+    store = InMemoryTaskStore(page_size=2)
+
+    created = [await store.create_task(metadata=TaskMetadata(ttl=60000)) for _ in range(4)]
+
+    tasks, next_cursor = await store.list_tasks()
+    assert [t.task_id for t in tasks] == [t.task_id for t in created[:2]]
+    assert next_cursor == created[1].task_id
+
+    tasks, next_cursor = await store.list_tasks(cursor=next_cursor)
+    assert [t.task_id for t in tasks] == [t.task_id for t in created[2:]]
+    assert next_cursor is None
+
+    store.cleanup()
+
+
+@pytest.mark.anyio
+async def test_max_tasks_evicts_oldest_terminal_task() -> None:
+    """Test that a full store evicts the oldest finished task, not active ones."""
+    store = InMemoryTaskStore(max_tasks=3)
+
+    active = await store.create_task(metadata=TaskMetadata(ttl=None))
+    done_first = await store.create_task(metadata=TaskMetadata(ttl=None))
+    done_second = await store.create_task(metadata=TaskMetadata(ttl=None))
+    await store.update_task(done_second.task_id, status="completed")
+    await store.update_task(done_first.task_id, status="failed")
+
+    new_task = await store.create_task(metadata=TaskMetadata(ttl=None))
+
+    assert list(store._tasks) == [active.task_id, done_second.task_id, new_task.task_id]
+
+    store.cleanup()
+
+
+@pytest.mark.anyio
+async def test_max_tasks_rejects_when_all_active() -> None:
+    """Test that a full store of active tasks refuses new tasks."""
+    store = InMemoryTaskStore(max_tasks=2)
+    await store.create_task(metadata=TaskMetadata(ttl=None))
+    await store.create_task(metadata=TaskMetadata(ttl=None))
+
+    with pytest.raises(ValueError, match="Task limit of 2 reached"):
+        await store.create_task(metadata=TaskMetadata(ttl=None))
+    assert len(store._tasks) == 2
+
+    store.cleanup()
+
+
 @pytest.mark.anyio
 async def test_list_tasks_invalid_cursor(store: InMemoryTaskStore) -> None:
     """Test that invalid cursor raises."""
@@ -183,6 +259,20 @@ async def test_delete_task(store: InMemoryTaskStore) -> None:
     assert deleted is False
 
 
+@pytest.mark.anyio
+async def test_delete_task_wakes_waiters(store: InMemoryTaskStore) -> None:
+    """Test that deleting a task releases wait_for_update and drops its event."""
+    task = await store.create_task(metadata=TaskMetadata(ttl=60000))
+
+    with anyio.fail_after(5):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(store.wait_for_update, task.task_id)
+            await anyio.wait_all_tasks_blocked()
+            assert await store.delete_task(task.task_id) is True
+
+    assert task.task_id not in store._update_events
+
+
 @pytest.mark.anyio
 async def test_get_all_tasks_helper(store: InMemoryTaskStore) -> None:
     """Test the get_all_tasks debugging helper."""
@@ -221,9 +311,7 @@ async def test_task_expiration_cleanup(store: InMemoryTaskStore) -> None:
     task = await store.create_task(metadata=TaskMetadata(ttl=1))  # 1ms TTL
 
     # Manually force the expiry to be in the past
-    stored = store._tasks.get(task.task_id)
-    assert stored is not None
-    stored.expires_at = datetime.now(timezone.utc) - timedelta(seconds=10)
+    set_expiry(store, task.task_id, datetime.now(timezone.utc) - timedelta(seconds=10))
 
     # Task should still exist in internal dict but be expired
     assert task.task_id in store._tasks
@@ -237,6 +325,16 @@ async def test_task_expiration_cleanup(store: InMemoryTaskStore) -> None:
     assert len(tasks) == 0
 
 
+@pytest.mark.anyio
+async def test_expiry_measured_from_created_at(store: InMemoryTaskStore) -> None:
+    """Test that a new task expires exactly ttl after its created_at."""
+    task = await store.create_task(metadata=TaskMetadata(ttl=60000))
+
+    stored = store._tasks.get(task.task_id)
+    assert stored is not None
+    assert stored.expires_at == task.created_at + timedelta(milliseconds=60000)
+
+
 @pytest.mark.anyio
 async def test_task_with_null_ttl_never_expires(store: InMemoryTaskStore) -> None:
     """Test that tasks with null TTL never expire during cleanup."""
@@ -278,6 +376,72 @@ async def test_terminal_task_ttl_reset(store: InMemoryTaskStore) -> None:
     assert new_expiry is not None
     assert new_expiry >= initial_expiry
 
+    # The new expiry is measured from the same instant as last_updated_at
+    assert new_expiry == stored.task.last_updated_at + timedelta(milliseconds=60000)
+
+
+@pytest.mark.anyio
+async def test_expired_tasks_drained_in_one_pass(store: InMemoryTaskStore, caplog: pytest.LogCaptureFixture) -> None:
+    """Test that all tasks due at the same time are removed by a single cleanup."""
+    doomed = [await store.create_task(metadata=TaskMetadata(ttl=60000)) for _ in range(3)]
+    survivor = await store.create_task(metadata=TaskMetadata(ttl=60000))
+
+    past = datetime.now(timezone.utc) - timedelta(seconds=10)
+    for task in doomed:
+        set_expiry(store, task.task_id, past)
+
+    with caplog.at_level(logging.DEBUG, logger="mcp.shared.experimental.tasks.in_memory_task_store"):
+        await store.get_task(survivor.task_id)
+
+    assert list(store._tasks) == [survivor.task_id]
+    assert [r.getMessage() for r in caplog.records] == ["Cleaned up 3 expired tasks"]
+
+
+@pytest.mark.anyio
+async def test_expired_task_hidden_from_all_accessors(store: InMemoryTaskStore) -> None:
+    """Test that every accessor treats an expired task as gone, not just reads."""
+    task = await store.create_task(metadata=TaskMetadata(ttl=60000))
+    await store.store_result(task.task_id, CallToolResult(content=[TextContent(type="text", text="Done")]))
+
+    set_expiry(store, task.task_id, datetime.now(timezone.utc) - timedelta(seconds=10))
+
+    assert await store.get_result(task.task_id) is None
+    assert task.task_id not in store._tasks
+    with pytest.raises(ValueError, match="not found"):
+        await store.update_task(task.task_id, status="completed")
+    with pytest.raises(ValueError, match="not found"):
+        await store.wait_for_update(task.task_id)
+    assert await store.delete_task(task.task_id) is False
+
+
+@pytest.mark.anyio
+async def test_expiry_reset_outlives_original_deadline(store: InMemoryTaskStore) -> None:
+    """Test that a task whose expiry was reset is not removed at its original deadline."""
+    task = await store.create_task(metadata=TaskMetadata(ttl=None))
+
+    # An original deadline that has already passed...
+    set_expiry(store, task.task_id, datetime.now(timezone.utc) - timedelta(seconds=10))
+    # ...superseded by a reset into the future, as a terminal transition would
+    set_expiry(store, task.task_id, datetime.now(timezone.utc) + timedelta(seconds=60))
+
+    # The stale past-due entry is skipped, so the task survives cleanup
+    assert await store.get_task(task.task_id) is not None
+    assert len(store._expiry_heap) == 1
+
+
+@pytest.mark.anyio
+async def test_expiry_heap_compacts_stale_entries(store: InMemoryTaskStore) -> None:
+    """Test that entries left behind by deletes and expiry resets are compacted away."""
+    tasks = [await store.create_task(metadata=TaskMetadata(ttl=60000)) for _ in range(10)]
+    for task in tasks[:8]:
+        await store.delete_task(task.task_id)
+    # Completing resets the expiry, superseding the creation-time entry
+    await store.update_task(tasks[8].task_id, status="completed")
+
+    live = {(s.expires_at, task_id) for task_id, s in store._tasks.items()}
+    assert len(store._expiry_heap) <= 2 * len(store._tasks)
+    assert live <= set(store._expiry_heap)
+
 
 @pytest.mark.anyio
 async def test_terminal_status_transition_rejected(store: InMemoryTaskStore) -> None:
@@ -344,6 +508,10 @@ async def test_cancel_task_succeeds_for_working_task(store: InMemoryTaskStore) -
     assert retrieved is not None
     assert retrieved.status == "cancelled"
 
+    # The result carries exactly the stored task's fields, with no _meta
+    assert result.model_dump(exclude={"meta"}) == retrieved.model_dump()
+    assert result.meta is None
+
 
 @pytest.mark.anyio
 async def test_cancel_task_rejects_nonexistent_task(store: InMemoryTaskStore) -> None:
@@ -114,6 +114,19 @@ class TestInMemoryTaskMessageQueue:
         assert len(messages) == 3
         assert await queue.is_empty(task_id) is True
 
+    @pytest.mark.anyio
+    async def test_clear_detaches_returned_messages(self, queue: InMemoryTaskMessageQueue) -> None:
+        """Messages enqueued after clear do not appear in the list clear returned."""
+        task_id = "task-1"
+
+        await queue.enqueue(task_id, QueuedMessage(type="request", message=make_request(1)))
+        messages = await queue.clear(task_id)
+
+        await queue.enqueue(task_id, QueuedMessage(type="request", message=make_request(2)))
+
+        assert len(messages) == 1
+        assert await queue.is_empty(task_id) is False
+
     @pytest.mark.anyio
     async def test_clear_empty_queue(self, queue: InMemoryTaskMessageQueue) -> None:
         """Clear on empty queue returns empty list."""